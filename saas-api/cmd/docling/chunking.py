@@ -2,13 +2,23 @@
 Usage: 
 python chunking.py <markdown_file_path> <output_json_path> --name <name>
 """
+import io
 import os
-import json
+import orjson
 import uuid
 import re
+import bisect
+import random
+import secrets
 import logging
 import asyncio
+import argparse
+import itertools
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from keybert import KeyBERT
 import requests
@@ -29,61 +39,229 @@ def disable_ssl_verification():
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 disable_ssl_verification()
+# Prefer RE2's DFA engine for the bulk text cleaners: guaranteed linear-time
+# scans with no catastrophic backtracking on adversarial markdown
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = re
+
 # Regex patterns for cleaning
-RE_IMAGE_MD = re.compile(r"!\[.*?\]\(.*?\)")
-RE_LINK_MD = re.compile(r"\[(.*?)\]\((.*?)\)")
-RE_HTML_TAG = re.compile(r"<[^>]+>")
-RE_MARKDOWN_CHARS = re.compile(r"[*_`~|#>-]{1,}")
+# Single alternation fused from the image/link/HTML/markdown-chars patterns so
+# cleanup is one pass over the buffer instead of four separate .sub() scans
+RE_CLEANUP = _re2.compile(r"(!\[.*?\]\(.*?\))|\[(.*?)\]\(.*?\)|<[^>]+>|[*_`~|#>-]+")
+RE_WS = _re2.compile(r"\s+")
+# One fused scan classifies every line of interest: group 1 is the leading
+# pipe of a table line ('--' right after means a separator row), group 2 is a
+# '##' heading. lastindex dispatches without re-walking the buffer per pattern.
+RE_MD_SCAN = re.compile(r"(?m)^[ \t]*(?:(\|)|(##))")
+# Deleting these chars leaves a table separator line empty (C-speed check)
+SEP_LINE_CHARS = str.maketrans('', '', '-|: ')
+# Terms (dates, fiscal markers) whose presence marks a table row as a header
+# row; one compiled alternation replaces 13 substring scans per row
+RE_HEADER_INDICATOR = re.compile(
+    r"(?i)20(?:23|24|25|26)|fy|year|march|quarter|q[1-4]|june|september|december"
+)
+# Element labels that mark a page element as a heading-like candidate
+HEADING_LABELS = frozenset({'heading', 'title', 'section', 'caption'})
+
+# Characters that make a first-row cell look like a bare number, not a title
+NUMERIC_TITLE_CHARS = frozenset('0123456789., ')
+
+# Securely seeded PRNG for chunk/table IDs: uuid4 costs an os.urandom
+# syscall per call, which adds up over thousands of chunks
+_RNG = random.Random(secrets.token_bytes(16))
+
+
+def _fast_id() -> str:
+    """Random 32-char hex ID (uuid4-sized) without a per-call syscall."""
+    return f"{_RNG.getrandbits(64):016x}{_RNG.getrandbits(64):016x}"
+
+
+def _cleanup_repl(match: "re.Match") -> str:
+    """Dispatch callback for RE_CLEANUP: drop images, keep link text, blank the rest."""
+    if match.group(1):  # image markdown
+        return ""
+    if match.group(2) is not None:  # link markdown - keep the link text
+        # The kept text can itself carry tags or formatting chars
+        # ([**bold**](u), [<b>x</b>](u)); re-run the fused pattern on it
+        # so nested artifacts clean like the old multi-pass pipeline
+        return RE_CLEANUP.sub(_cleanup_repl, match.group(2))
+    return " "  # HTML tag or markdown formatting chars
+
+
+# Process-wide model cache so every MarkdownChunker sharing a model name
+# shares one set of weights instead of re-loading them per instance
+_MODEL_CACHE: Dict[str, SentenceTransformer] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+# Memoized per-type lookup of which page attribute a prov item carries, so
+# hot loops do one getattr instead of re-probing hasattr per item
+_PAGE_ATTRS = ('page_no', 'page')
+_page_attr_by_type: Dict[type, Optional[str]] = {}
+
+
+def _resolve_page_attr(prov_item) -> Optional[str]:
+    """Return the page attribute name for this prov item's type (cached)."""
+    item_type = type(prov_item)
+    try:
+        return _page_attr_by_type[item_type]
+    except KeyError:
+        attr = next((a for a in _PAGE_ATTRS if hasattr(prov_item, a)), None)
+        _page_attr_by_type[item_type] = attr
+        return attr
+
+
+# Embedding backend: "onnx" serves the model through ONNX Runtime
+# (quantization-friendly on CPU), "torch" is the stock backend
+_EMBED_BACKEND = os.getenv("HF_DOCLING_BACKEND", "onnx")
+
+
+def _load_sentence_transformer(model_name: str) -> SentenceTransformer:
+    """Load a SentenceTransformer, preferring the ONNX Runtime backend."""
+    if _EMBED_BACKEND == "onnx":
+        try:
+            return SentenceTransformer(model_name, backend="onnx")
+        except Exception as e:
+            logger.warning(f"ONNX backend unavailable ({e}), falling back to torch")
+
+    model = SentenceTransformer(model_name)
+    # Halve activation bytes on GPU; matmul-bound layers run ~2x faster
+    try:
+        import torch
+        if torch.cuda.is_available():
+            model = model.half()
+    except Exception as e:
+        logger.debug(f"Could not switch model to FP16: {e}")
+    return model
+
+
+def _get_embedding_model(model_name: str) -> SentenceTransformer:
+    """Load (or fetch the cached) SentenceTransformer for model_name."""
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(model_name)
+        if model is None:
+            model = _load_sentence_transformer(model_name)
+            _MODEL_CACHE[model_name] = model
+        return model
 
 
 class MarkdownChunker:
     """Chunks markdown files using Docling's HybridChunker"""
     
     def __init__(self, model_name: Optional[str] = None):
-        """Initialize the markdown chunker with embedding model"""
+        """Initialize the markdown chunker (embedding model loads lazily)"""
         if model_name is None:
             model_name = os.getenv("HF_DOCLING_MODEL", "intfloat/multilingual-e5-base")
-        
-        self.embedding_model = SentenceTransformer(model_name)
-        self.keyword_extractor = KeyBERT(model=self.embedding_model)
+
+        self.model_name = model_name
         self.chunk_size = 1024
         self.overlap = 50
         self.markdown_content = None  # Store markdown content for table title extraction
+        self._table_scan_cache = None  # (content, lines, table_starts)
+        # Pool for offloading regex cleaning so it overlaps chunk iteration
+        self._clean_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        # Memoized cleaner for section titles/headings, which repeat for
+        # every chunk under the same heading
+        self._clean_cached = functools.lru_cache(maxsize=256)(self.clean_text_from_html_and_md)
+        # Heading candidates per page object, shared by tables on one page
+        self._heading_cache: Dict[int, List[str]] = {}
+        # Heading classification per element-label string (tiny vocabulary)
+        self._label_is_heading: Dict[str, bool] = {}
+        # Whether a doc object carries a usable .pages list, keyed by id(doc)
+        self._doc_has_pages: Dict[int, bool] = {}
+
+    @functools.cached_property
+    def embedding_model(self) -> SentenceTransformer:
+        """Shared SentenceTransformer, loaded on first embedding use."""
+        return _get_embedding_model(self.model_name)
+
+    @functools.cached_property
+    def keyword_extractor(self) -> KeyBERT:
+        """KeyBERT wrapper around the shared embedding model."""
+        return KeyBERT(model=self.embedding_model)
     
     def clean_text_from_html_and_md(self, raw_text: str) -> str:
         """Remove HTML tags and Markdown artifacts, normalize whitespace."""
         if not raw_text:
             return ""
-        s = raw_text
-        s = RE_IMAGE_MD.sub("", s)
-        s = RE_LINK_MD.sub(r"\1", s)
-        s = RE_HTML_TAG.sub(" ", s)
-        s = RE_MARKDOWN_CHARS.sub(" ", s)
-        s = re.sub(r"\s+", " ", s).strip()
+        s = RE_CLEANUP.sub(_cleanup_repl, raw_text)
+        s = RE_WS.sub(" ", s).strip()
         return s
     
-    async def extract_keywords(self, text: str, top_n: int = 15) -> List[Dict[str, str]]:
-        """Extract keywords from text using KeyBERT (async wrapper)."""
-        clean = self.clean_text_from_html_and_md(text)
-        if not clean:
-            return []
-        
+    async def extract_keywords(
+        self,
+        texts: List[str],
+        doc_embeddings=None,
+        top_n: int = 15
+    ) -> List[List[Dict[str, str]]]:
+        """
+        Extract keywords for a batch of texts using one KeyBERT call (async wrapper).
+
+        Pre-computed doc_embeddings (e.g. from encode_batch) are passed through
+        so KeyBERT reuses them instead of re-embedding every document.
+        """
+        clean_texts = [self.clean_text_from_html_and_md(text) for text in texts]
+        # Empty docs must not reach the shared vectorizer call, so only
+        # non-empty texts go in and their results map back by position
+        non_empty = [idx for idx, text in enumerate(clean_texts) if text]
+        if not non_empty:
+            return [[] for _ in texts]
+
         try:
             # Run keyword extraction in thread pool to avoid blocking
             def _extract():
-                keywords = self.keyword_extractor.extract_keywords(
-                    clean,
+                docs = [clean_texts[idx] for idx in non_empty]
+                embeddings = doc_embeddings
+                if embeddings is not None:
+                    embeddings = np.asarray([doc_embeddings[idx] for idx in non_empty])
+                results = self.keyword_extractor.extract_keywords(
+                    docs=docs,
+                    doc_embeddings=embeddings,
                     keyphrase_ngram_range=(1, 3),
                     stop_words='english',
                     top_n=top_n
                 )
-                return [{"value": kw[0], "score": float(kw[1])} for kw in keywords]
-            
+                # KeyBERT returns a flat keyword list for a single document
+                if len(docs) == 1:
+                    results = [results]
+                keywords = [[] for _ in texts]
+                for pos, idx in enumerate(non_empty):
+                    keywords[idx] = [
+                        {"value": kw[0], "score": float(kw[1])} for kw in results[pos]
+                    ]
+                return keywords
+
             return await asyncio.to_thread(_extract)
         except Exception as e:
             logger.warning(f"Failed to extract keywords: {e}")
-            return []
+            return [[] for _ in texts]
     
+    def encode_batch(self, texts: List[str], batch_size: int = 64):
+        """
+        Embed a list of texts in a single batched encode() call.
+
+        Texts are sorted by length before encoding (smart batching - similar
+        lengths per batch minimize padding) and the resulting embeddings are
+        restored to the original order.
+        """
+        if not texts:
+            return []
+
+        order = sorted(range(len(texts)), key=lambda idx: len(texts[idx]))
+        sorted_embeddings = self.embedding_model.encode(
+            [texts[idx] for idx in order],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+        embeddings = [None] * len(texts)
+        for pos, idx in enumerate(order):
+            embeddings[idx] = sorted_embeddings[pos]
+        return embeddings
+
     async def process_markdown_file(
         self,
         markdown_file_path: str,
@@ -116,9 +294,16 @@ class MarkdownChunker:
         try:
             from docling.document_converter import DocumentConverter
             from docling.chunking import HybridChunker
+            from docling.datamodel.base_models import DocumentStream
             
             logger.info(f"Processing markdown file: {markdown_file_path}")
-            
+
+            # The memos key by id(), which a later document's objects can
+            # reuse once the old ones are collected; the chunker outlives a
+            # single document, so start each file with empty caches
+            self._heading_cache.clear()
+            self._doc_has_pages.clear()
+
             # Handle output path - if it's a directory, create a filename
             if os.path.isdir(output_json_path):
                 # Generate output filename based on input filename
@@ -150,9 +335,14 @@ class MarkdownChunker:
             async with aiofiles.open(markdown_file_path, 'r', encoding='utf-8') as f:
                 self.markdown_content = await f.read()
             
-            # Convert markdown file to Docling document
+            # Convert markdown to Docling document, feeding the bytes already
+            # read above so the file is not re-opened and re-read from disk
             document_converter = DocumentConverter()
-            result = document_converter.convert(source=markdown_file_path)
+            stream = DocumentStream(
+                name=os.path.basename(markdown_file_path),
+                stream=io.BytesIO(self.markdown_content.encode('utf-8'))
+            )
+            result = document_converter.convert(source=stream)
             doc = result.document
             
             # Store document reference for table extraction
@@ -161,22 +351,45 @@ class MarkdownChunker:
             # Initialize HybridChunker
             chunker = HybridChunker(chunk_size=self.chunk_size, overlap=self.overlap)
             
-            # Open JSON file for streaming writes
-            output_file = await aiofiles.open(output_json_path, 'w', encoding='utf-8')
-            
+            # Open JSON file for streaming byte writes (orjson emits bytes)
+            output_file = await aiofiles.open(output_json_path, 'wb')
+
+            # Buffer outgoing bytes and hand them to aiofiles in ~1MB batches
+            # so the thread-pool hop happens per megabyte, not per write
+            write_buf = bytearray()
+
+            async def _buffered_write(data: bytes):
+                write_buf.extend(data)
+                if len(write_buf) >= (1 << 20):
+                    await output_file.write(bytes(write_buf))
+                    write_buf.clear()
+
             # Write document header
-            await output_file.write('{\n')
-            await output_file.write(f'  "name": {json.dumps(name)},\n')
-            await output_file.write(f'  "id": {json.dumps(id)},\n')
-            # await output_file.write(f'  "document_type": {json.dumps(document_type if document_type else "markdown")},\n')
-            # await output_file.write(f'  "document_format": {json.dumps(document_format if document_format else "md")},\n')
-            # await output_file.write(f'  "document_year": {json.dumps(document_year)},\n')
-            # await output_file.write(f'  "document_quarter": {json.dumps(document_quarter)},\n')
-            await output_file.write('  "chunks": [\n')
+            await _buffered_write(b'{\n')
+            await _buffered_write(b'  "name": ' + orjson.dumps(name) + b',\n')
+            await _buffered_write(b'  "id": ' + orjson.dumps(id) + b',\n')
+            # await _buffered_write(b'  "document_type": ' + orjson.dumps(document_type if document_type else "markdown") + b',\n')
+            # await _buffered_write(b'  "document_format": ' + orjson.dumps(document_format if document_format else "md") + b',\n')
+            # await _buffered_write(b'  "document_year": ' + orjson.dumps(document_year) + b',\n')
+            # await _buffered_write(b'  "document_quarter": ' + orjson.dumps(document_quarter) + b',\n')
+            await _buffered_write(b'  "chunks": [\n')
             
             # Track chunks for writing
             Index = 0
             is_first_chunk = True
+
+            # The caller-supplied metadata repeats identically in every chunk:
+            # serialize the shared pairs once and splice them per chunk
+            meta_prefix = orjson.dumps(metadata)[1:-1]
+            if meta_prefix:
+                meta_prefix += b','
+
+            def _chunk_metadata(section_title: str, content_type: str) -> orjson.Fragment:
+                return orjson.Fragment(
+                    b'{' + meta_prefix
+                    + b'"section_title":' + orjson.dumps(section_title)
+                    + b',"content_type":"' + content_type.encode('utf-8') + b'"}'
+                )
             
             # Process tables
             if hasattr(doc, 'tables') and doc.tables:
@@ -187,11 +400,9 @@ class MarkdownChunker:
                         page_number = 1
                         if hasattr(table, 'prov') and table.prov:
                             for prov_item in table.prov:
-                                if hasattr(prov_item, 'page_no'):
-                                    page_number = prov_item.page_no
-                                    break
-                                elif hasattr(prov_item, 'page'):
-                                    page_number = prov_item.page
+                                page_attr = _resolve_page_attr(prov_item)
+                                if page_attr:
+                                    page_number = getattr(prov_item, page_attr)
                                     break
                         
                         # Extract table structure
@@ -217,7 +428,7 @@ class MarkdownChunker:
                         # data_rows = table_data_raw[num_header_rows:]  # Body without headers
                         
                         # Generate unique table_id for this table
-                        table_id = str(uuid.uuid4())
+                        table_id = _fast_id()
                                 
                         
                         # Create TABLE chunk
@@ -229,27 +440,21 @@ class MarkdownChunker:
                         }
                         
                         whole_table_chunk = {
-                            "id": str(uuid.uuid4()),
+                            "id": _fast_id(),
                             "Index": Index,
                             "table": table_metadata,
-                            "metadata": {
-                                **metadata,
-                                "section_title": section_title,
-                                "content_type": "table",
-                            }
+                            "metadata": _chunk_metadata(section_title, "table")
                         }
                         
-                        # Write chunk to file immediately
+                        # Write chunk to the buffer immediately
                         if not is_first_chunk:
-                            await output_file.write(',\n')
+                            await _buffered_write(b',\n')
                         else:
                             is_first_chunk = False
-                        
-                        chunk_json = json.dumps(whole_table_chunk, indent=2, ensure_ascii=False)
+
+                        chunk_json = orjson.dumps(whole_table_chunk, option=orjson.OPT_INDENT_2)
                         # Indent the chunk JSON
-                        indented_chunk = '\n'.join('    ' + line for line in chunk_json.split('\n'))
-                        await output_file.write(indented_chunk)
-                        await output_file.flush()
+                        await _buffered_write(b'    ' + chunk_json.replace(b'\n', b'\n    '))
                         
                         Index += 1
                         # logger.info(f"Extracted WHOLE table {table_idx + 1} '{section_title}' from page {page_number} with {len(data_rows)} data rows and {num_header_rows} header rows") 
@@ -259,8 +464,12 @@ class MarkdownChunker:
                         logger.warning(f"Failed to extract table {table_idx}: {e}")
             
             # Process text chunks using HybridChunker
+            # Phase 1: collect cleaned texts and per-chunk metadata so the
+            # embedding model sees one batched encode instead of a forward
+            # pass per chunk; writes happen afterwards in original order
             chunk_iter = chunker.chunk(dl_doc=doc)
-            
+            pending_chunks = []  # (chunk_text_for_embedding, section_title)
+
             for i, chunk in enumerate(chunk_iter):
                 chunk_text = chunk.text
                 
@@ -268,17 +477,19 @@ class MarkdownChunker:
                 try:
                     enriched_text = chunker.contextualize(chunk=chunk)
                     if enriched_text and enriched_text != chunk_text:
-                        chunk_text_for_embedding = self.clean_text_from_html_and_md(enriched_text)
+                        text_to_clean = enriched_text
                     else:
-                        chunk_text_for_embedding = self.clean_text_from_html_and_md(chunk_text)
+                        text_to_clean = chunk_text
                 except Exception as e:
                     logger.warning(f"Failed to contextualize chunk {i}: {e}")
-                    chunk_text_for_embedding = self.clean_text_from_html_and_md(chunk_text)
-                
-                # Skip empty chunks
-                if not chunk_text_for_embedding or len(chunk_text_for_embedding.strip()) < 10:
-                    continue
-                
+                    text_to_clean = chunk_text
+
+                # Offload cleaning to the thread pool; the future is resolved
+                # at the barrier below so regex work overlaps chunk iteration
+                clean_future = self._clean_executor.submit(
+                    self.clean_text_from_html_and_md, text_to_clean
+                )
+
                 # Skip chunks that are primarily table content
                 is_table_chunk = False
                 if hasattr(chunk, 'meta') and chunk.meta and hasattr(chunk.meta, 'doc_items'):
@@ -288,7 +499,7 @@ class MarkdownChunker:
                             break
                 
                 if is_table_chunk:
-                    logger.debug(f"Skipping chunk {i} as it's part of a table")
+                    logger.debug("Skipping chunk %d as it's part of a table", i)
                     continue
                 
                 # Extract page number
@@ -303,12 +514,9 @@ class MarkdownChunker:
                         
                         if hasattr(first_item, 'prov') and first_item.prov:
                             for prov_item in first_item.prov:
-                                if hasattr(prov_item, 'page_no'):
-                                    page_number = prov_item.page_no
-                                    page_found = True
-                                    break
-                                elif hasattr(prov_item, 'page'):
-                                    page_number = prov_item.page
+                                page_attr = _resolve_page_attr(prov_item)
+                                if page_attr:
+                                    page_number = getattr(prov_item, page_attr)
                                     page_found = True
                                     break
                         
@@ -332,12 +540,12 @@ class MarkdownChunker:
                 
                 if hasattr(chunk, 'meta') and chunk.meta:
                     if 'section' in chunk.meta and chunk.meta['section']:
-                        section_title = self.clean_text_from_html_and_md(str(chunk.meta['section']))[:100]
+                        section_title = self._clean_cached(str(chunk.meta['section']))[:100]
                     elif hasattr(chunk.meta, 'headings') and chunk.meta.headings:
                         heading = chunk.meta.headings[-1] if isinstance(chunk.meta.headings, list) else str(chunk.meta.headings)
-                        section_title = self.clean_text_from_html_and_md(str(heading))[:100]
+                        section_title = self._clean_cached(str(heading))[:100]
                     elif hasattr(chunk.meta, 'heading') and chunk.meta.heading:
-                        section_title = self.clean_text_from_html_and_md(str(chunk.meta.heading))[:100]
+                        section_title = self._clean_cached(str(chunk.meta.heading))[:100]
                 
                 # Try to extract from doc_items if still "Unknown"
                 if section_title == "Unknown Section" and hasattr(chunk, 'meta') and chunk.meta and hasattr(chunk.meta, 'doc_items'):
@@ -345,50 +553,73 @@ class MarkdownChunker:
                         item_label = str(getattr(item, 'label', '')).lower()
                         if any(h in item_label for h in ['heading', 'title', 'section']):
                             if hasattr(item, 'text') and item.text:
-                                section_title = self.clean_text_from_html_and_md(str(item.text))[:100]
+                                section_title = self._clean_cached(str(item.text))[:100]
                             break
                 
                 # Try to extract from first line as last resort
                 if section_title == "Unknown Section":
-                    first_lines = chunk_text.split('\n')[:3]
+                    # maxsplit stops after the third newline; the rest of the
+                    # chunk stays one unscanned tail string
+                    first_lines = chunk_text.split('\n', 3)[:3]
                     for line in first_lines:
                         line = line.strip()
                         if line and (line.isupper() or line.startswith('#')):
-                            section_title = self.clean_text_from_html_and_md(line)[:100]
+                            section_title = self._clean_cached(line)[:100]
                             break
                         elif len(line) > 10 and len(line) < 100:
-                            section_title = self.clean_text_from_html_and_md(line)[:100]
+                            section_title = self._clean_cached(line)[:100]
                             break
                 
-                # Create chunk in specified format
+                pending_chunks.append((clean_future, section_title))
+
+            # Barrier: resolve cleaning futures and drop empty chunks
+            resolved_chunks = []
+            for clean_future, section_title in pending_chunks:
+                chunk_text_for_embedding = await asyncio.wrap_future(clean_future)
+                if not chunk_text_for_embedding or len(chunk_text_for_embedding.strip()) < 10:
+                    continue
+                resolved_chunks.append((chunk_text_for_embedding, section_title))
+            pending_chunks = resolved_chunks
+
+            # Phase 2: one batched encode over all chunk texts (smart
+            # batching), then one KeyBERT pass that reuses those embeddings
+            # instead of re-embedding every chunk
+            chunk_texts = [text for text, _ in pending_chunks]
+            chunk_embeddings = self.encode_batch(chunk_texts)
+            chunk_keywords = await self.extract_keywords(
+                chunk_texts, doc_embeddings=chunk_embeddings
+            )
+
+            # Phase 3: write chunks in original order
+            for (chunk_text_for_embedding, section_title), keywords in zip(
+                pending_chunks, chunk_keywords
+            ):
                 chunk_obj = {
-                    "id": str(uuid.uuid4()),
+                    "id": _fast_id(),
                     "content": chunk_text_for_embedding,
                     "Index": Index,
-                    "metadata": {
-                        **metadata,
-                        "section_title": section_title[:100],
-                        "content_type": "text",
-                    }
+                    "keywords": keywords,
+                    "metadata": _chunk_metadata(section_title[:100], "text")
                 }
-                
-                # Write chunk to file immediately
+
+                # Write chunk to the buffer immediately
                 if not is_first_chunk:
-                    await output_file.write(',\n')
+                    await _buffered_write(b',\n')
                 else:
                     is_first_chunk = False
-                
-                chunk_json = json.dumps(chunk_obj, indent=2, ensure_ascii=False)
+
+                chunk_json = orjson.dumps(chunk_obj, option=orjson.OPT_INDENT_2)
                 # Indent the chunk JSON
-                indented_chunk = '\n'.join('    ' + line for line in chunk_json.split('\n'))
-                await output_file.write(indented_chunk)
-                await output_file.flush()
-                
+                await _buffered_write(b'    ' + chunk_json.replace(b'\n', b'\n    '))
+
                 Index += 1
-            
-            # Close JSON structure
-            await output_file.write('\n  ]\n')
-            await output_file.write('}\n')
+
+            # Close JSON structure and flush the remaining buffered bytes
+            await _buffered_write(b'\n  ]\n')
+            await _buffered_write(b'}\n')
+            if write_buf:
+                await output_file.write(bytes(write_buf))
+                write_buf.clear()
             await output_file.close()
             
             logger.info(f"Successfully created {Index} chunks and saved to {output_json_path}")
@@ -522,7 +753,7 @@ class MarkdownChunker:
                 continue
             
             # Skip separator lines
-            if all(c in '-|: ' for c in line):
+            if not line.translate(SEP_LINE_CHARS):
                 continue
             
             # Split by pipes and clean up
@@ -542,28 +773,24 @@ class MarkdownChunker:
         if not table_data:
             return ""
         
-        # Find maximum width for each column
-        col_widths = []
-        max_cols = max(len(row) for row in table_data) if table_data else 0
-        
-        for col_idx in range(max_cols):
-            max_width = 0
-            for row in table_data:
-                if col_idx < len(row):
-                    max_width = max(max_width, len(str(row[col_idx])))
-            col_widths.append(max(max_width, 3))
-        
+        # Pad to a rectangular cell grid and let numpy compute the per-column
+        # widths in one C-level pass instead of a nested Python loop
+        max_cols = max(len(row) for row in table_data)
+        grid = np.array(
+            [[str(cell) for cell in row] + [''] * (max_cols - len(row)) for row in table_data],
+            dtype=object
+        )
+        col_widths = np.maximum(np.frompyfunc(len, 1, 1)(grid).max(axis=0).astype(int), 3)
+
         # Build markdown table
         markdown_lines = []
-        
-        for row_idx, row in enumerate(table_data):
-            padded_row = row + [''] * (max_cols - len(row))
-            
-            formatted_cells = []
-            for col_idx, cell in enumerate(padded_row):
-                cell_str = str(cell).ljust(col_widths[col_idx])
-                formatted_cells.append(cell_str)
-            
+
+        for row_idx, padded_row in enumerate(grid):
+            formatted_cells = [
+                cell.ljust(col_widths[col_idx])
+                for col_idx, cell in enumerate(padded_row)
+            ]
+
             markdown_lines.append('| ' + ' | '.join(formatted_cells) + ' |')
             
             # Add separator after first row
@@ -584,20 +811,17 @@ class MarkdownChunker:
         cleaned_data = []
         for row in table_data:
             cleaned_row = []
-            prev_value = None
-            
-            for cell in row:
-                cell_str = str(cell).strip()
-                # Only add if it's different from the previous value
-                if cell_str != prev_value or not cell_str:
-                    cleaned_row.append(cell_str)
-                    prev_value = cell_str
-                # If it's a duplicate and not empty, skip it
-            
-            # If all values were duplicates and we ended up with just one cell, keep the original
+            # groupby collapses each run of equal values to one cell in C;
+            # runs of empty cells are kept in full
+            for value, group in itertools.groupby(str(cell).strip() for cell in row):
+                if value:
+                    cleaned_row.append(value)
+                else:
+                    cleaned_row.extend(group)
+
             if len(cleaned_row) >= 1:
                 cleaned_data.append(cleaned_row)
-        
+
         return cleaned_data
     
     def _table_to_text(self, table_data: List[List[str]]) -> str:
@@ -612,6 +836,51 @@ class MarkdownChunker:
         
         return '\n'.join(text_lines)
     
+    def _markdown_table_index(self) -> tuple:
+        """
+        Split the markdown once and locate the starting line of every table.
+
+        Table lines are found with a compiled multiline regex (single C-level
+        scan) and grouped into runs; separator rows ('|--') extend a table but
+        never start one. Line numbers of '##' headings are indexed in the same
+        pass. The result is cached per markdown_content so each table lookup
+        shares one scan instead of re-walking the whole buffer.
+
+        Returns:
+            tuple: (lines, table_starts, heading_lines) as line numbers
+        """
+        cache = self._table_scan_cache
+        if cache is not None and cache[0] is self.markdown_content:
+            return cache[1], cache[2], cache[3]
+
+        content = self.markdown_content
+        lines = content.split('\n')
+        heading_lines = []
+        table_starts = []
+        in_table = False
+        prev_line_no = -2
+        line_no = 0
+        pos = 0
+
+        for match in RE_MD_SCAN.finditer(content):
+            line_no += content.count('\n', pos, match.start())
+            pos = match.start()
+            if match.lastindex == 2:
+                heading_lines.append(line_no)
+                continue
+            if line_no > prev_line_no + 1:
+                # Non-table line(s) in between ended the previous table
+                in_table = False
+            if content.startswith('--', match.end()):
+                pass  # separator row: keeps the current table open
+            elif not in_table:
+                table_starts.append(line_no)
+                in_table = True
+            prev_line_no = line_no
+
+        self._table_scan_cache = (content, lines, table_starts, heading_lines)
+        return lines, table_starts, heading_lines
+
     def _extract_markdown_table_title_and_header(self, table_idx: int, table_data: List[List[str]]) -> tuple:
         """
         Extract table title from markdown heading and identify header rows.
@@ -620,182 +889,217 @@ class MarkdownChunker:
             tuple: (table_title, header_rows_count, subtitle)
         """
         try:
+            _dbg = logger.isEnabledFor(logging.DEBUG)
             if not self.markdown_content or not table_data:
                 return None, 1, None
             
-            # Split markdown into lines
-            lines = self.markdown_content.split('\n')
-            
-            # Find all table starts in markdown
-            table_starts = []
-            in_table = False
-            
-            for i, line in enumerate(lines):
-                line_stripped = line.strip()
-                is_table_line = line_stripped.startswith('|') and not line_stripped.startswith('|--')
-                
-                if is_table_line and not in_table:
-                    # Start of a new table
-                    table_starts.append(i)
-                    in_table = True
-                elif not is_table_line and not line_stripped.startswith('|--'):
-                    # Not a table line, reset in_table
-                    in_table = False
-            
-            logger.debug(f"Found {len(table_starts)} tables in markdown, looking for table {table_idx}")
+            # Shared table index: one scan of the buffer serves every table
+            lines, table_starts, heading_lines = self._markdown_table_index()
+
+            if _dbg:
+                logger.debug("Found %d tables in markdown, looking for table %d", len(table_starts), table_idx)
             
             if table_idx >= len(table_starts):
-                logger.debug(f"Table index {table_idx} out of range, only {len(table_starts)} tables found")
+                if _dbg:
+                    logger.debug("Table index %d out of range, only %d tables found", table_idx, len(table_starts))
                 return None, 1, None
             
             table_start_idx = table_starts[table_idx]
-            logger.debug(f"Table {table_idx} starts at line {table_start_idx}")
+            if _dbg:
+                logger.debug("Table %d starts at line %d", table_idx, table_start_idx)
             
-            # Look backwards for heading (##) and subtitle
+            # Look backwards for heading (##) and subtitle. Work here is
+            # bounded by the 4-line lookback window (plus one bisect probe),
+            # never by the distance from the start of the file.
             table_title = None
             subtitle = None
             potential_title_without_hash = None
-            
-            for i in range(table_start_idx - 1, max(-1, table_start_idx - 5), -1):
-                line = lines[i].strip()
-                
-                # Skip empty lines
-                if not line:
-                    continue
-                
-                # Check for markdown heading (## prefix)
-                if line.startswith('##'):
-                    table_title = line.lstrip('#').strip()
-                    logger.debug(f"Found table title with ##: {table_title}")
-                    
-                    # Check for subtitle (line between heading and table)
-                    for j in range(i + 1, table_start_idx):
-                        potential_subtitle = lines[j].strip()
-                        if potential_subtitle and potential_subtitle.startswith('(') and potential_subtitle.endswith(')'):
-                            subtitle = potential_subtitle
-                            logger.debug(f"Found subtitle: {subtitle}")
-                            break
-                    break
-                
-                # Check for text that could be a title (not a table row, reasonable length)
-                elif not line.startswith('|') and 10 < len(line) < 150 and not line.startswith('*'):
-                    # Could be a title without ## marker
-                    if not potential_title_without_hash:
-                        potential_title_without_hash = line
-                        logger.debug(f"Found potential title without ##: {potential_title_without_hash}")
+
+            # Nearest '##' heading above the table via bisect on the heading
+            # index (only headings within the 4-line lookback window count)
+            window_lo = max(0, table_start_idx - 4)
+            heading_pos = bisect.bisect_left(heading_lines, table_start_idx) - 1
+            heading_idx = None
+            if heading_pos >= 0 and heading_lines[heading_pos] >= window_lo:
+                heading_idx = heading_lines[heading_pos]
+
+            # Strip each window line once; the heading, subtitle and fallback
+            # scans below all index this instead of re-stripping
+            stripped_window = [lines[i].strip() for i in range(window_lo, table_start_idx)]
+
+            if heading_idx is not None:
+                table_title = stripped_window[heading_idx - window_lo].lstrip('# ')
+                if _dbg:
+                    logger.debug("Found table title with ##: %s", table_title)
+
+                # Check for subtitle (line between heading and table)
+                for j in range(heading_idx + 1, table_start_idx):
+                    potential_subtitle = stripped_window[j - window_lo]
+                    if potential_subtitle and potential_subtitle.startswith('(') and potential_subtitle.endswith(')'):
+                        subtitle = potential_subtitle
+                        if _dbg:
+                            logger.debug("Found subtitle: %s", subtitle)
+                        break
+
+            if not table_title:
+                # No usable heading: take the closest text line between the
+                # heading (if any) and the table that could be a title
+                scan_lo = heading_idx if heading_idx is not None else window_lo - 1
+                for i in range(table_start_idx - 1, scan_lo, -1):
+                    # Branch on the first char instead of stacking
+                    # startswith calls
+                    stripped = stripped_window[i - window_lo]
+                    if not stripped:
+                        continue
+                    first_char = stripped[0]
+                    if first_char == '|' or first_char == '*':
+                        continue
+                    if 10 < len(stripped) < 150:
+                        potential_title_without_hash = stripped
+                        if _dbg:
+                            logger.debug("Found potential title without ##: %s", potential_title_without_hash)
+                        break
             
             # If no ## heading found, use potential title without hash
             if not table_title and potential_title_without_hash:
                 table_title = potential_title_without_hash
-                logger.debug(f"Using title without ##: {table_title}")
+                if _dbg:
+                    logger.debug("Using title without ##: %s", table_title)
             
             # Detect number of header rows by analyzing table structure
             num_header_rows = 1
             if len(table_data) >= 3:
-                # Check if first 2-3 rows contain headers (dates, column names)
-                header_indicators = ['2023', '2024', '2025', '2026', 'fy', 'year', 'march', 'quarter', 'q1', 'q2', 'q3', 'q4', 'june', 'september', 'december']
-                
-                # Check second row
-                if len(table_data) >= 2:
-                    second_row_text = ' '.join([str(cell).lower() for cell in table_data[1]])
-                    if any(indicator in second_row_text for indicator in header_indicators):
-                        num_header_rows = 2
-                        logger.debug(f"Detected 2 header rows")
-                
-                # Check third row
-                if len(table_data) >= 3 and num_header_rows == 2:
-                    third_row_text = ' '.join([str(cell).lower() for cell in table_data[2]])
-                    if any(indicator in third_row_text for indicator in header_indicators):
-                        num_header_rows = 3
-                        logger.debug(f"Detected 3 header rows")
-            
-            logger.debug(f"Returning: title='{table_title}', num_headers={num_header_rows}, subtitle='{subtitle}'")
+                # Rows 2-3 count as headers while they contain dates/fiscal
+                # markers; the compiled case-insensitive alternation scans
+                # each row once
+                for row_idx in (1, 2):
+                    if RE_HEADER_INDICATOR.search(' '.join(map(str, table_data[row_idx]))):
+                        num_header_rows = row_idx + 1
+                        if _dbg:
+                            logger.debug("Detected %d header rows", num_header_rows)
+                    else:
+                        break
+            
+            if _dbg:
+                logger.debug("Returning: title='%s', num_headers=%d, subtitle='%s'", table_title, num_header_rows, subtitle)
             return table_title, num_header_rows, subtitle
             
         except Exception as e:
-            logger.warning(f"Error extracting markdown table title: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error extracting markdown table title: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Markdown table title traceback", exc_info=True)
             return None, 1, None
     
+    def _page_heading_candidates(self, page) -> List[str]:
+        """
+        Collect heading/caption texts from a page's elements.
+
+        Classified once per page object and cached, so every table on the
+        same page reuses the list instead of re-labeling all elements.
+        """
+        key = id(page)
+        cached = self._heading_cache.get(key)
+        if cached is not None:
+            return cached
+
+        heading_candidates = []
+        label_is_heading = self._label_is_heading
+        for element in page.elements:
+            element_label = str(getattr(element, 'label', '')).lower()
+            is_heading = label_is_heading.get(element_label)
+            if is_heading is None:
+                is_heading = any(heading_type in element_label for heading_type in HEADING_LABELS)
+                label_is_heading[element_label] = is_heading
+
+            element_text = getattr(element, 'text', None)
+            if element_text:
+                element_text = str(element_text).strip()
+
+                if len(element_text) < 3:
+                    continue
+
+                if is_heading:
+                    heading_candidates.append(element_text)
+                elif 'table' in element_text.lower() and len(element_text) < 150:
+                    heading_candidates.append(element_text)
+
+        self._heading_cache[key] = heading_candidates
+        return heading_candidates
+
     def _extract_table_title(self, table, doc, page_number: int, table_idx: int, table_data: List[List[str]] = None) -> str:
         """Extract the title/heading for a table"""
         try:
+            # Each method assigns `result` instead of returning, so the
+            # 100-char cap (and optional prefix) is applied in one place.
+            result = None
+            prefix = ''
+
             # Method 1: Check for table caption
             if hasattr(table, 'caption') and table.caption:
                 caption = str(table.caption).strip()
                 if caption and len(caption) > 3:
-                    title = self.clean_text_from_html_and_md(caption)
-                    if title and not title.lower().startswith('table'):
-                        return f"Table: {title}"[:100]
-                    return title[:100]
-            
+                    result = self.clean_text_from_html_and_md(caption)
+                    if result and not result.lower().startswith('table'):
+                        prefix = 'Table: '
+
             # Method 2: Check for title in metadata
-            if hasattr(table, 'data') and isinstance(table.data, dict):
+            if result is None and hasattr(table, 'data') and isinstance(table.data, dict):
                 if 'title' in table.data and table.data['title']:
                     title = self.clean_text_from_html_and_md(str(table.data['title']))
                     if title and len(title) > 3:
-                        return title[:100]
-            
+                        result = title
+
             # Method 3: Look for heading near table
-            if hasattr(doc, 'pages') and doc.pages and page_number > 0:
-                try:
-                    page_idx = page_number - 1
-                    if page_idx < len(doc.pages):
-                        page = doc.pages[page_idx]
-                        
-                        if hasattr(page, 'elements'):
-                            heading_candidates = []
-                            
-                            for element in page.elements:
-                                element_label = str(getattr(element, 'label', '')).lower()
-                                is_heading = any(heading_type in element_label for heading_type in 
-                                               ['heading', 'title', 'section', 'caption'])
-                                
-                                if hasattr(element, 'text') and element.text:
-                                    element_text = str(element.text).strip()
-                                    
-                                    if len(element_text) < 3:
-                                        continue
-                                    
-                                    if is_heading:
-                                        heading_candidates.append(element_text)
-                                    elif 'table' in element_text.lower() and len(element_text) < 150:
-                                        heading_candidates.append(element_text)
-                            
-                            if heading_candidates:
-                                title = self.clean_text_from_html_and_md(heading_candidates[-1])
-                                if title and len(title) > 3:
-                                    return title[:100]
-                except Exception as e:
-                    logger.debug(f"Error extracting heading from page elements: {e}")
-            
+            if result is None:
+                doc_key = id(doc)
+                has_pages = self._doc_has_pages.get(doc_key)
+                if has_pages is None:
+                    has_pages = bool(getattr(doc, 'pages', None))
+                    self._doc_has_pages[doc_key] = has_pages
+                if has_pages and page_number > 0:
+                    try:
+                        page_idx = page_number - 1
+                        if page_idx < len(doc.pages):
+                            page = doc.pages[page_idx]
+
+                            if hasattr(page, 'elements'):
+                                heading_candidates = self._page_heading_candidates(page)
+
+                                if heading_candidates:
+                                    title = self.clean_text_from_html_and_md(heading_candidates[-1])
+                                    if title and len(title) > 3:
+                                        result = title
+                    except Exception as e:
+                        logger.debug("Error extracting heading from page elements: %s", e)
+
             # Method 4: Check first row
-            if table_data is None:
-                table_data = self._extract_table_structure(table)
-            
-            if table_data and len(table_data) > 0:
-                first_row = table_data[0]
-                if len(first_row) == 1 and len(str(first_row[0])) > 10:
-                    potential_title = str(first_row[0]).strip()
-                    if not potential_title.replace('.', '').replace(',', '').replace(' ', '').isdigit():
-                        title = self.clean_text_from_html_and_md(potential_title)
-                        if title:
-                            return title[:100]
-            
+            if result is None:
+                if table_data is None:
+                    table_data = self._extract_table_structure(table)
+
+                if table_data and len(table_data) > 0:
+                    first_row = table_data[0]
+                    if len(first_row) == 1 and len(str(first_row[0])) > 10:
+                        potential_title = str(first_row[0]).strip()
+                        if not all(c in NUMERIC_TITLE_CHARS for c in potential_title):
+                            title = self.clean_text_from_html_and_md(potential_title)
+                            if title:
+                                result = title
+
+            if result is not None:
+                return (prefix + result)[:100]
+
             # Fallback
             return f"Page {page_number} - Table {table_idx + 1}"
             
             
         except Exception as e:
-            logger.debug(f"Error extracting table title: {e}")
+            logger.debug("Error extracting table title: %s", e)
             return f"Page {page_number if page_number else 'Unknown'} - Table {table_idx + 1}"
 
 
-async def main():
-    """CLI interface for chunking markdown files (async)"""
-    import argparse
-    
+def _build_cli_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once at module level so repeat invocations reuse it."""
     parser = argparse.ArgumentParser(description='Chunk markdown files using Docling HybridChunker')
     parser.add_argument('input_md', help='Path to input markdown file')
     parser.add_argument('output_json', help='Path to output JSON file')
@@ -807,15 +1111,23 @@ async def main():
     parser.add_argument('--document-quarter', help='Document quarter (e.g., Q1, Q2, Q3, Q4)')
     parser.add_argument('--metadata', help='Additional metadata as JSON string')
     parser.add_argument('--model', help='Embedding model name', default='intfloat/multilingual-e5-base')
-    
-    args = parser.parse_args()
-    
+    return parser
+
+
+_CLI_PARSER = _build_cli_parser()
+
+
+async def main():
+    """CLI interface for chunking markdown files (async)"""
+    args = _CLI_PARSER.parse_args()
+
     # Parse metadata if provided
     metadata = {}
     if args.metadata:
         try:
-            metadata = json.loads(args.metadata)
-        except json.JSONDecodeError:
+            # orjson takes bytes directly, skipping an internal utf-8 decode
+            metadata = orjson.loads(args.metadata.encode('utf-8'))
+        except orjson.JSONDecodeError:
             logger.error("Invalid metadata JSON")
             return
     
@@ -1,6 +1,7 @@
 """
 Configuration for document processing and Weaviate connection
 """
+import functools
 import os
 from pathlib import Path
 
@@ -19,11 +20,12 @@ PROCESSED_DIR = BASE_DIR / "processed"
 DATA_FOLDER = BASE_DIR / "docling" / "data_folder"
 OUTPUT_FOLDER = DATA_FOLDER / "output"
 
-# Ensure directories exist
-UPLOAD_DIR.mkdir(exist_ok=True)
-PROCESSED_DIR.mkdir(exist_ok=True)
-DATA_FOLDER.mkdir(exist_ok=True)
-OUTPUT_FOLDER.mkdir(exist_ok=True, parents=True)
+@functools.lru_cache(maxsize=None)
+def ensure_dirs() -> None:
+    """Create the working directories on first use instead of at import time."""
+    for directory in (UPLOAD_DIR, PROCESSED_DIR, DATA_FOLDER):
+        directory.mkdir(exist_ok=True)
+    OUTPUT_FOLDER.mkdir(exist_ok=True, parents=True)
 
 # Processing Configuration
 DEFAULT_CHUNK_LIMIT = int(os.getenv("DEFAULT_CHUNK_LIMIT", "10"))
@@ -32,7 +34,8 @@ BATCH_SIZE = 10
 
 # File Upload Configuration
 MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", "100000000"))  # 100MB
-ALLOWED_EXTENSIONS = [
+# Values are lowercase; callers should .lower() the extension once before testing.
+ALLOWED_EXTENSIONS = frozenset({
     ".docx", ".dotx", ".docm", ".dotm",  # Word documents
     ".pptx",  # PowerPoint
     ".pdf",  # PDF
@@ -43,4 +46,4 @@ ALLOWED_EXTENSIONS = [
     ".xlsx", ".xlsm",  # Excel
     ".txt",  # Text
     ".json",  # JSON
-]
+})
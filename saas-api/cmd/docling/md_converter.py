@@ -10,12 +10,11 @@ Key Optimizations:
 5. Memory-efficient processing with backpressure control
 
 Thread-Safety Fixes:
-1. Thread-local DocumentConverter instances
-2. File-level locks for concurrent writes
-3. Atomic file operations with temp files
-4. Unique filename generation
-5. Thread-safe logging with QueueHandler (no duplicates)
-6. Per-task executors to avoid shared state
+1. Shared DocumentConverter instances keyed by config
+2. Atomic file operations with temp files + os.replace
+3. Race-free unique filename generation (O_CREAT|O_EXCL)
+4. Thread-safe logging with QueueHandler (no duplicates)
+5. Shared long-lived executor so converter caches are reused
 
 Usage: 
     python md_converter.py document.pdf ./output
@@ -31,6 +30,7 @@ import aiohttp
 from pathlib import Path
 from docling.datamodel.layout_model_specs import LayoutModelConfig
 import urllib3
+import requests
 from urllib.parse import urlparse
 import logging
 import logging.handlers
@@ -38,14 +38,13 @@ from typing import List, Optional, Dict
 import time
 import argparse
 from concurrent.futures import ThreadPoolExecutor
-from functools import partial
+from functools import lru_cache, partial
 import threading
-from collections import defaultdict
-from asyncio import Lock as AsyncLock
 import errno
 
 from docling.datamodel.base_models import InputFormat, ConversionStatus
 from docling.datamodel.pipeline_options import (
+    EasyOcrOptions,
     LayoutOptions,
     TableFormerMode,
     TableStructureOptions,
@@ -61,17 +60,25 @@ from docling.document_converter import (
     ExcelFormatOption,
     CsvFormatOption,
 )
+from docling_core.types.doc import ImageRefMode
 from docling.pipeline.threaded_standard_pdf_pipeline import ThreadedStandardPdfPipeline
 from docling.pipeline.simple_pipeline import SimplePipeline
 from docling.datamodel.settings import settings
 
 # ==================== THREAD-SAFE GLOBALS ====================
 
-# Thread-local storage for DocumentConverter instances
-_converter_local = threading.local()
+# Process-global converter cache: one DocumentConverter (and one model
+# load) per unique config, shared across threads
+_converter_cache: Dict[tuple, DocumentConverter] = {}
+_converter_cache_lock = threading.Lock()
 
-# File-level locks for async writes
-_file_locks = defaultdict(AsyncLock)
+# Shared executor for CPU-bound conversions (created on first use, sized once)
+_converter_pool = None
+_converter_pool_lock = threading.Lock()
+
+# Shared aiohttp session (created on first use, bound to the running loop)
+_http_session = None
+_http_session_loop = None
 
 # Logging initialization
 _logging_listener = None
@@ -80,7 +87,7 @@ _logging_initialized = False
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-SUPPORTED_FORMATS = {
+SUPPORTED_FORMATS = frozenset({
     "docx", "dotx", "docm", "dotm",  # Word documents
     "pptx",  # PowerPoint
     "pdf",  # PDF
@@ -91,7 +98,7 @@ SUPPORTED_FORMATS = {
     "xlsx", "xlsm",  # Excel
     "txt",  # Text
     "json",  # JSON
-}
+})
 
 # ==================== LOGGING SETUP ====================
 
@@ -109,9 +116,10 @@ def setup_logging():
         # Clear any existing handlers to prevent duplicates
         root.handlers.clear()
         
-        # Create queue for thread-safe logging
+        # Create queue for thread-safe logging (SimpleQueue: C-implemented,
+        # cheaper put/get than queue.Queue's lock-per-operation)
         import queue
-        log_queue = queue.Queue(-1)
+        log_queue = queue.SimpleQueue()
         
         # Queue handler (thread-safe)
         queue_handler = logging.handlers.QueueHandler(log_queue)
@@ -142,7 +150,6 @@ logger = logging.getLogger(__name__)
 
 def disable_ssl_verification():
     """Disable SSL verification for requests (called after logging setup)"""
-    import requests
     original_init = requests.Session.__init__
 
     def patched_init(self, *args, **kwargs):
@@ -167,25 +174,115 @@ def safe_mkdir(path: Path):
             raise
 
 def get_unique_filename(base_name: str, output_dir: Path, extension: str = ".md") -> Path:
-    """Generate unique filename to prevent overwrites"""
+    """Generate unique filename to prevent overwrites (race-free)"""
     output_file = output_dir / f"{base_name}{extension}"
     counter = 1
-    
-    # Thread-safe check-and-increment
-    while output_file.exists():
-        output_file = output_dir / f"{base_name}_{counter}{extension}"
-        counter += 1
-    
-    return output_file
+
+    # O_CREAT|O_EXCL atomically claims the name in one syscall, so two
+    # workers can never pick the same file (exists() probes raced)
+    while True:
+        try:
+            os.close(os.open(output_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return output_file
+        except FileExistsError:
+            output_file = output_dir / f"{base_name}_{counter}{extension}"
+            counter += 1
+
+def get_converter_pool(max_workers: int = None) -> ThreadPoolExecutor:
+    """
+    Get or create the shared conversion executor (thread-safe)
+
+    A single long-lived pool keeps worker threads alive across tasks so
+    cached converters are actually reused instead of being rebuilt for
+    every document.
+    """
+    global _converter_pool
+
+    with _converter_pool_lock:
+        if _converter_pool is None:
+            if max_workers is None:
+                max_workers = os.cpu_count() or 1
+            _converter_pool = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="docling-worker"
+            )
+            logger.debug(f"Created shared converter pool ({max_workers} workers)")
+
+        return _converter_pool
+
+def shutdown_converter_pool():
+    """Shut down the shared conversion executor (idempotent)"""
+    global _converter_pool
+
+    with _converter_pool_lock:
+        if _converter_pool is not None:
+            _converter_pool.shutdown(wait=True)
+            _converter_pool = None
+
+# Encode-and-write slice size for markdown output (chars per slice)
+_MD_WRITE_SLICE = 1 << 20
+
+def write_markdown_atomic(md_text: str, output_file: Path) -> int:
+    """
+    Write markdown to output_file atomically, encoding in slices
+
+    Encoding the export one slice at a time keeps peak memory at
+    str + one slice instead of str + full UTF-8 copy, which matters for
+    image-heavy documents with embedded base64. Returns bytes written.
+    """
+    temp_file = output_file.with_suffix('.tmp')
+    bytes_written = 0
+    try:
+        with open(temp_file, 'wb', buffering=1 << 20) as f:
+            for start in range(0, len(md_text), _MD_WRITE_SLICE):
+                bytes_written += f.write(
+                    md_text[start:start + _MD_WRITE_SLICE].encode('utf-8')
+                )
+        os.replace(temp_file, output_file)
+    except Exception:
+        if temp_file.exists():
+            temp_file.unlink()
+        raise
+
+    return bytes_written
+
+def export_markdown_to_file(doc, output_file: Path, image_mode: str) -> int:
+    """
+    Export a converted document to markdown on disk, returning bytes written
+
+    referenced mode writes image payloads as sibling files and links
+    them, avoiding the 4/3 base64 blowup of embedded mode; Docling only
+    supports that through save_as_markdown, so the atomic sliced write
+    applies to the in-memory modes.
+    """
+    if image_mode == "referenced":
+        doc.save_as_markdown(
+            output_file,
+            image_mode=ImageRefMode.REFERENCED,
+            artifacts_dir=output_file.with_name(f"{output_file.stem}_images"),
+        )
+        return output_file.stat().st_size
+
+    md_text = doc.export_to_markdown(image_mode=image_mode)
+    return write_markdown_atomic(md_text, output_file)
 
 def create_session_no_ssl():
     """Create SSL-disabled requests session without global state mutation"""
-    import requests
     session = requests.Session()
     session.verify = False
     session.trust_env = False
     return session
 
+# Shared requests session for sync paths (created on first use)
+_sync_session = None
+
+def get_sync_session():
+    """Get or create the shared SSL-disabled requests session"""
+    global _sync_session
+    if _sync_session is None:
+        _sync_session = create_session_no_ssl()
+    return _sync_session
+
 # ==================== CONFIGURATION ====================
 
 def configure_global_settings(
@@ -208,6 +305,25 @@ def configure_global_settings(
     logger.info(f"Global settings: doc_batch={doc_batch_size}, "
                 f"page_batch={page_batch_size}, elements_batch={elements_batch_size}")
 
+@lru_cache(maxsize=1)
+def _detect_accelerator():
+    """Resolve the accelerator actually present: ('cuda', vram_gb) / ('mps', None) / ('cpu', None)"""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            vram_gb = torch.cuda.get_device_properties(0).total_memory / (1 << 30)
+            return "cuda", vram_gb
+        if torch.backends.mps.is_available():
+            return "mps", None
+    except Exception:
+        pass
+    return "cpu", None
+
+@lru_cache(maxsize=8)
+def _ocr_options_for(ocr_lang: tuple) -> EasyOcrOptions:
+    """One EasyOcrOptions instance per language set, shared across converters"""
+    return EasyOcrOptions(lang=list(ocr_lang))
+
 def create_threaded_converter(
     ocr_enabled: bool = True,
     queue_size: int = 20,
@@ -215,6 +331,8 @@ def create_threaded_converter(
     layout_batch: int = 12,
     table_batch: int = 12,
     ocr_lang: List[str] = None,
+    generate_page_images: bool = False,
+    generate_picture_images: bool = True,
 ) -> DocumentConverter:
     """
     Create optimized DocumentConverter with ThreadedStandardPdfPipeline
@@ -233,7 +351,9 @@ def create_threaded_converter(
         layout_batch: Layout analysis batch size
         table_batch: Table structure batch size
         ocr_lang: OCR languages
-    
+        generate_page_images: Rasterize full pages (only needed when embedding them)
+        generate_picture_images: Rasterize figures for embedded image mode
+
     Returns:
         Configured DocumentConverter
     """
@@ -245,6 +365,20 @@ def create_threaded_converter(
         num_threads=8,
         device=AcceleratorDevice.AUTO,
     )
+
+    # Auto-tune batches for the device actually present: CPU inference
+    # gains nothing from batching but pays a per-item workspace arena,
+    # while GPUs need batch >= 16 before batching beats single items
+    device_kind, vram_gb = _detect_accelerator()
+    if device_kind == "cpu":
+        queue_size, ocr_batch, layout_batch, table_batch = 4, 1, 1, 2
+    elif device_kind == "cuda":
+        gpu_batch = min(64, max(16, int(vram_gb * 2)))
+        ocr_batch = max(ocr_batch, gpu_batch)
+        layout_batch = max(layout_batch, gpu_batch)
+        table_batch = max(table_batch, gpu_batch // 2)
+    logger.info(f"Auto-tuned for {device_kind}: queue={queue_size}, "
+                f"batches=[{ocr_batch},{layout_batch},{table_batch}]")
     table_structure_options = TableStructureOptions(
         mode=TableFormerMode.ACCURATE,
         do_cell_matching=True,
@@ -254,8 +388,8 @@ def create_threaded_converter(
         accelerator_options=accelerator_options,
         do_ocr=ocr_enabled,
         do_table_structure=True,
-        generate_page_images=True,
-        generate_picture_images=True,
+        generate_page_images=generate_page_images,
+        generate_picture_images=generate_picture_images,
         images_scale=1.0,
         table_structure_options=table_structure_options,
         
@@ -267,10 +401,9 @@ def create_threaded_converter(
         batch_polling_interval_seconds=0.1,
     )
     
-    # Add OCR options if enabled
+    # Add OCR options if enabled (shared per-language-set instance)
     if ocr_enabled:
-        from docling.datamodel.pipeline_options import EasyOcrOptions
-        pdf_pipeline_options.ocr_options = EasyOcrOptions(lang=ocr_lang)
+        pdf_pipeline_options.ocr_options = _ocr_options_for(tuple(ocr_lang))
     
     # Create converter with all format options
     converter = DocumentConverter(
@@ -302,63 +435,107 @@ def create_threaded_converter(
     
     return converter
 
-def get_thread_local_converter(
+def get_shared_converter(
     ocr_enabled: bool = True,
     queue_size: int = 12,
     ocr_batch: int = 10,
     layout_batch: int = 10,
     table_batch: int = 8,
-    ocr_lang: List[str] = None
+    ocr_lang: List[str] = None,
+    generate_page_images: bool = False,
+    generate_picture_images: bool = True
 ) -> DocumentConverter:
     """
-    Get or create thread-local DocumentConverter instance (thread-safe)
-    
-    Each thread gets its own converter to avoid race conditions
+    Get or create the shared DocumentConverter for a config (thread-safe)
+
+    ThreadedStandardPdfPipeline builds per-run stage contexts, so one
+    converter (and its ~GB of models) can serve all worker threads; a
+    per-thread instance multiplied the model footprint by the pool size.
     """
-    if not hasattr(_converter_local, 'converter'):
-        _converter_local.converter = create_threaded_converter(
-            ocr_enabled=ocr_enabled,
-            queue_size=queue_size,
-            ocr_batch=ocr_batch,
-            layout_batch=layout_batch,
-            table_batch=table_batch,
-            ocr_lang=ocr_lang
-        )
-        logger.debug(f"Created thread-local converter for {threading.current_thread().name}")
-    
-    return _converter_local.converter
+    key = (ocr_enabled, queue_size, ocr_batch, layout_batch, table_batch,
+           tuple(ocr_lang or ("en",)), generate_page_images, generate_picture_images)
+
+    converter = _converter_cache.get(key)
+    if converter is None:
+        with _converter_cache_lock:
+            converter = _converter_cache.get(key)
+            if converter is None:
+                converter = create_threaded_converter(
+                    ocr_enabled=ocr_enabled,
+                    queue_size=queue_size,
+                    ocr_batch=ocr_batch,
+                    layout_batch=layout_batch,
+                    table_batch=table_batch,
+                    ocr_lang=ocr_lang,
+                    generate_page_images=generate_page_images,
+                    generate_picture_images=generate_picture_images
+                )
+                _converter_cache[key] = converter
+
+    return converter
 
 # ==================== ASYNC I/O UTILITIES ====================
 
+async def get_http_session(max_concurrent: int = 4) -> aiohttp.ClientSession:
+    """
+    Get or create the shared aiohttp session (SSL disabled, pooled)
+
+    One long-lived session keeps connections warm across downloads instead
+    of paying connector setup per request. Rebuilt if the running loop
+    changed (sync callers spin up their own short-lived loops).
+    """
+    global _http_session, _http_session_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ssl=False,
+                limit=max_concurrent * 2,
+                limit_per_host=max_concurrent
+            ),
+            timeout=aiohttp.ClientTimeout(total=300)
+        )
+        _http_session_loop = loop
+
+    return _http_session
+
+async def close_http_session():
+    """Close the shared aiohttp session (idempotent)"""
+    global _http_session
+
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
 async def download_file_async(url: str, output_path: Path) -> Path:
     """Download file asynchronously with progress (SSL-safe)"""
     temp_file = None
     try:
-        # Use aiohttp with SSL disabled
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                
-                # Use temp file for atomic write
-                temp_file = output_path.with_suffix('.tmp')
-                
-                async with aiofiles.open(temp_file, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(8192):
-                        await f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size:
-                            progress = (downloaded / total_size) * 100
-                            logger.debug(f"Download {output_path.name}: {progress:.1f}%")
-                
-                # Atomic rename
-                temp_file.rename(output_path)
-                logger.info(f"Downloaded: {output_path.name}")
-                return output_path
-                
+        session = await get_http_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+
+            total_size = int(response.headers.get('content-length', 0))
+            downloaded = 0
+
+            # Use temp file for atomic write
+            temp_file = output_path.with_suffix('.tmp')
+
+            async with aiofiles.open(temp_file, 'wb') as f:
+                # 1 MiB chunks amortize the per-await cost on fast links
+                async for chunk in response.content.iter_chunked(1 << 20):
+                    await f.write(chunk)
+                    downloaded += len(chunk)
+                    if total_size and logger.isEnabledFor(logging.DEBUG):
+                        progress = (downloaded / total_size) * 100
+                        logger.debug(f"Download {output_path.name}: {progress:.1f}%")
+
+            # Atomic replace (guaranteed cross-platform, unlike rename)
+            os.replace(temp_file, output_path)
+            logger.info(f"Downloaded: {output_path.name}")
+            return output_path
+
     except Exception as e:
         logger.error(f"Download failed {url}: {e}")
         # Cleanup temp file
@@ -369,31 +546,32 @@ async def download_file_async(url: str, output_path: Path) -> Path:
 async def save_markdown_async(content: str, output_path: Path) -> Path:
     """
     Save markdown content asynchronously with atomic write
-    Uses file-level locking and temp file for safety
+
+    No per-file lock is needed: get_unique_filename hands out a fresh
+    path per write and os.replace makes the final publish atomic.
     """
     try:
-        # Get file-specific lock
-        lock = _file_locks[str(output_path)]
-        
-        async with lock:
-            # Write to temp file first
-            temp_file = output_path.with_suffix('.tmp')
-            
-            try:
-                async with aiofiles.open(temp_file, 'w', encoding='utf-8') as f:
-                    await f.write(content)
-                
-                # Atomic rename (POSIX guarantee)
-                temp_file.rename(output_path)
-                
-            except Exception as e:
-                # Cleanup on error
-                if temp_file.exists():
-                    temp_file.unlink()
-                raise
-        
+        # Write to temp file first
+        temp_file = output_path.with_suffix('.tmp')
+
+        try:
+            # Encode in slices so the full UTF-8 copy never coexists
+            # with the export string (see write_markdown_atomic)
+            async with aiofiles.open(temp_file, 'wb') as f:
+                for start in range(0, len(content), _MD_WRITE_SLICE):
+                    await f.write(content[start:start + _MD_WRITE_SLICE].encode('utf-8'))
+
+            # Atomic replace (guaranteed cross-platform, unlike rename)
+            os.replace(temp_file, output_path)
+
+        except Exception:
+            # Cleanup on error
+            if temp_file.exists():
+                temp_file.unlink()
+            raise
+
         return output_path
-        
+
     except Exception as e:
         logger.error(f"Failed to save {output_path}: {e}")
         raise
@@ -404,14 +582,16 @@ async def process_txt_file_async(input_source: str, output_path: Path) -> Path:
     
     try:
         if parsed.scheme in ("http", "https"):
-            connector = aiohttp.TCPConnector(ssl=False)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(input_source) as response:
-                    response.raise_for_status()
-                    text_data = await response.text()
+            session = await get_http_session()
+            async with session.get(input_source) as response:
+                response.raise_for_status()
+                text_data = await response.text()
         else:
-            async with aiofiles.open(input_source, 'r', encoding='utf-8') as f:
-                text_data = await f.read()
+            # to_thread + stdlib read beats aiofiles, which trampolines
+            # every read through the executor separately
+            text_data = await asyncio.to_thread(
+                Path(input_source).read_text, encoding='utf-8'
+            )
         
         filename = Path(parsed.path if parsed.scheme else input_source).stem
         output_file = get_unique_filename(filename, output_path)
@@ -426,6 +606,35 @@ async def process_txt_file_async(input_source: str, output_path: Path) -> Path:
 
 # ==================== SYNC PROCESSING ====================
 
+def process_txt_file_sync(input_source: str, output_dir: Path) -> Path:
+    """
+    Handle TXT file conversion synchronously (SSL-safe)
+
+    Plain blocking I/O: spinning up an event loop per TXT file costs more
+    than the read itself for small files.
+    """
+    parsed = urlparse(input_source)
+
+    try:
+        if parsed.scheme in ("http", "https"):
+            response = get_sync_session().get(input_source, timeout=300)
+            response.raise_for_status()
+            text_data = response.text
+        else:
+            with open(input_source, 'r', encoding='utf-8') as f:
+                text_data = f.read()
+
+        filename = Path(parsed.path if parsed.scheme else input_source).stem
+        output_file = get_unique_filename(filename, output_dir)
+
+        write_markdown_atomic(text_data, output_file)
+        logger.info(f"TXT converted: {output_file.name}")
+        return output_file
+
+    except Exception as e:
+        logger.error(f"TXT conversion failed: {e}")
+        raise
+
 def validate_input(input_source: str) -> tuple[str, str]:
     """Validate input and extract filename and extension"""
     parsed = urlparse(input_source)
@@ -433,14 +642,19 @@ def validate_input(input_source: str) -> tuple[str, str]:
     if parsed.scheme in ("http", "https"):
         filename = Path(parsed.path).name
     else:
-        if not Path(input_source).exists():
+        # Single stat() instead of exists()+name (two syscalls)
+        try:
+            os.stat(input_source)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {input_source}")
         filename = Path(input_source).name
     
-    if "." not in filename:
+    # rpartition: one scan, no component-list allocation
+    _, dot, ext = filename.rpartition(".")
+    if not dot:
         raise ValueError("Could not detect file extension")
-    
-    ext = filename.split(".")[-1].lower()
+
+    ext = ext.lower()
     
     if ext not in SUPPORTED_FORMATS:
         raise ValueError(f"Unsupported format: {ext}. Supported: {', '.join(SUPPORTED_FORMATS)}")
@@ -450,27 +664,22 @@ def validate_input(input_source: str) -> tuple[str, str]:
 def convert_single_sync(
     input_source: str,
     output_dir: Path,
-    converter_config: Dict
+    converter_config: Dict,
+    image_mode: str = "referenced"
 ) -> Optional[Path]:
     """
     Convert single document synchronously (thread-safe)
-    Uses thread-local converter instance
+    Uses the shared converter instance
     """
     try:
         filename, ext = validate_input(input_source)
         
-        # Handle TXT files (run async in thread)
+        # Handle TXT files (plain sync I/O, no event-loop spin-up)
         if ext == "txt":
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(
-                process_txt_file_async(input_source, output_dir)
-            )
-            loop.close()
-            return result
+            return process_txt_file_sync(input_source, output_dir)
         
-        # Get thread-local converter (thread-safe)
-        converter = get_thread_local_converter(**converter_config)
+        # Get shared converter (thread-safe)
+        converter = get_shared_converter(**converter_config)
         
         # Convert with Docling
         logger.info(f"Converting: {filename}")
@@ -484,18 +693,13 @@ def convert_single_sync(
             # Log processing metrics
             logger.info(f"Processed {len(doc.pages)} pages from {filename}")
             
-            md_text = doc.export_to_markdown(image_mode="embedded")
-            
             # Use unique filename to prevent race conditions
             output_file = get_unique_filename(Path(filename).stem, output_dir)
-            
-            # Atomic write
-            temp_file = output_file.with_suffix('.tmp')
-            temp_file.write_text(md_text, encoding='utf-8')
-            temp_file.rename(output_file)
-            
+
+            bytes_written = export_markdown_to_file(doc, output_file, image_mode)
+
             elapsed = time.time() - start
-            logger.info(f"✓ Converted: {filename} → {output_file.name} ({elapsed:.2f}s, {len(md_text)/1024:.1f} KB)")
+            logger.info(f"✓ Converted: {filename} → {output_file.name} ({elapsed:.2f}s, {bytes_written/1024:.1f} KB)")
             return output_file
         else:
             logger.error(f"✗ Conversion failed: {filename} - {result.status}")
@@ -509,24 +713,26 @@ def batch_convert_sync(
     input_sources: List[str],
     output_dir: Path,
     converter_config: Dict,
-    raises_on_error: bool = False
+    raises_on_error: bool = False,
+    image_mode: str = "referenced"
 ) -> List[Optional[Path]]:
     """
     Batch convert using Docling's native convert_all() (thread-safe)
     
-    Uses thread-local converter to avoid race conditions
+    Uses the shared converter instance
     """
-    # Separate TXT files
+    # Separate TXT files; validate once and keep the stem so the result
+    # loop does not re-parse every source
     txt_files = []
     other_files = []
-    
+
     for source in input_sources:
         try:
-            _, ext = validate_input(source)
+            filename, ext = validate_input(source)
             if ext == "txt":
                 txt_files.append(source)
             else:
-                other_files.append(source)
+                other_files.append((source, Path(filename).stem))
         except Exception as e:
             logger.error(f"Skipping invalid input '{source}': {e}")
     
@@ -543,29 +749,23 @@ def batch_convert_sync(
         start = time.time()
         
         try:
-            # Get thread-local converter
-            converter = get_thread_local_converter(**converter_config)
+            # Get shared converter
+            converter = get_shared_converter(**converter_config)
             
             # Use Docling's native batch processing
             batch_results = converter.convert_all(
-                other_files,
+                [source for source, _ in other_files],
                 raises_on_error=raises_on_error
             )
-            
-            for source, result in zip(other_files, batch_results):
+
+            for (source, stem), result in zip(other_files, batch_results):
                 try:
                     if result.status == ConversionStatus.SUCCESS:
-                        filename = Path(urlparse(source).path if "://" in source else source).stem
                         doc = result.document
-                        
-                        md_text = doc.export_to_markdown(image_mode="embedded")
-                        output_file = get_unique_filename(filename, output_dir)
-                        
-                        # Atomic write
-                        temp_file = output_file.with_suffix('.tmp')
-                        temp_file.write_text(md_text, encoding='utf-8')
-                        temp_file.rename(output_file)
-                        
+
+                        output_file = get_unique_filename(stem, output_dir)
+                        export_markdown_to_file(doc, output_file, image_mode)
+
                         logger.info(f"✓ Converted: {output_file.name} ({len(doc.pages)} pages)")
                         results.append(output_file)
                     else:
@@ -577,7 +777,7 @@ def batch_convert_sync(
                     results.append(None)
             
             elapsed = time.time() - start
-            successful = len([r for r in results if r is not None])
+            successful = sum(1 for r in results if r is not None)
             logger.info(f"Batch complete: {successful}/{len(input_sources)} files in {elapsed:.2f}s")
             
         except Exception as e:
@@ -592,11 +792,12 @@ def batch_convert_sync(
 async def convert_single_async(
     input_source: str,
     output_dir: Path,
-    converter_config: Dict
+    converter_config: Dict,
+    image_mode: str = "referenced"
 ) -> Optional[Path]:
     """
     Convert single document asynchronously (thread-safe)
-    CPU-bound conversion runs in dedicated thread pool with thread-local converter
+    CPU-bound conversion runs in the shared thread pool with the shared converter
     """
     try:
         filename, ext = validate_input(input_source)
@@ -609,25 +810,22 @@ async def convert_single_async(
         logger.info(f"Converting: {filename}")
         start = time.time()
         
-        loop = asyncio.get_event_loop()
-        
-        # Use dedicated executor per task to ensure thread-local converter
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            result = await loop.run_in_executor(
-                executor,
-                lambda: get_thread_local_converter(**converter_config).convert(input_source)
-            )
+        loop = asyncio.get_running_loop()
+
+        # Shared executor: worker threads (and their converters) persist across tasks
+        result = await loop.run_in_executor(
+            get_converter_pool(),
+            lambda: get_shared_converter(**converter_config).convert(input_source)
+        )
         
         if result.status == ConversionStatus.SUCCESS:
             doc = result.document
 
-            md_text = doc.export_to_markdown(image_mode="embedded")
-            
             # Use unique filename
             output_file = get_unique_filename(Path(filename).stem, output_dir)
-            
-            # Async atomic write
-            await save_markdown_async(md_text, output_file)
+
+            # Export + write off the event loop
+            await asyncio.to_thread(export_markdown_to_file, doc, output_file, image_mode)
             
             elapsed = time.time() - start
             logger.info(f"✓ Converted: {filename} → {output_file.name} ({elapsed:.2f}s, {len(doc.pages)} pages)")
@@ -644,7 +842,8 @@ async def batch_convert_async(
     input_sources: List[str],
     output_dir: Path,
     converter_config: Dict,
-    max_concurrent: int = 4
+    max_concurrent: int = 4,
+    image_mode: str = "referenced"
 ) -> List[Optional[Path]]:
     """
     Async batch conversion with concurrency control (thread-safe)
@@ -655,32 +854,97 @@ async def batch_convert_async(
         converter_config: Converter configuration dict
         max_concurrent: Maximum concurrent conversions
     """
-    semaphore = asyncio.Semaphore(max_concurrent)
-    
-    async def convert_with_semaphore(source):
-        async with semaphore:
-            return await convert_single_async(source, output_dir, converter_config)
-    
+    # Size the shared pools to the concurrency limit (no-op if already created)
+    get_converter_pool(max_workers=min(os.cpu_count() or 1, max_concurrent))
+    await get_http_session(max_concurrent=max_concurrent)
+
     logger.info(f"Async batch converting {len(input_sources)} files (max_concurrent={max_concurrent})...")
     start = time.time()
-    
-    # Process all files concurrently
-    tasks = [convert_with_semaphore(source) for source in input_sources]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Handle exceptions
-    final_results = []
-    for result in results:
-        if isinstance(result, Exception):
-            logger.error(f"Task failed: {result}")
-            final_results.append(None)
-        else:
-            final_results.append(result)
-    
+
+    loop = asyncio.get_running_loop()
+    final_results: List[Optional[Path]] = [None] * len(input_sources)
+
+    # Partition inputs, keeping original indices and precomputed stems
+    txt_items = []
+    other_items = []
+    for index, source in enumerate(input_sources):
+        try:
+            # to_thread keeps the validation stat() off the event loop
+            filename, ext = await asyncio.to_thread(validate_input, source)
+            if ext == "txt":
+                txt_items.append((index, source))
+            else:
+                other_items.append((index, source, Path(filename).stem))
+        except Exception as e:
+            logger.error(f"Skipping invalid input '{source}': {e}")
+
+    # TXT files don't go through Docling
+    for index, source in txt_items:
+        try:
+            final_results[index] = await process_txt_file_async(source, output_dir)
+        except Exception as e:
+            logger.error(f"Task failed: {e}")
+
+    # One convert_all call keeps all five ThreadedStandardPdfPipeline
+    # stages fed across documents; per-file convert() drained the
+    # pipeline between docs. Results stream back through the loop as
+    # they finish so export/write overlaps the next doc's conversion.
+    results_queue: asyncio.Queue = asyncio.Queue()
+    # Bounded handoff: the feeder blocks once this many fully-converted
+    # documents are waiting on export/write, so ConversionResults (whole
+    # docs with images) never accumulate without backpressure
+    pending_slots = threading.Semaphore(max_concurrent * 2)
+
+    def feed_results():
+        try:
+            converter = get_shared_converter(**converter_config)
+            batch_results = converter.convert_all(
+                [source for _, source, _ in other_items],
+                raises_on_error=False
+            )
+            for item, result in zip(other_items, batch_results):
+                pending_slots.acquire()
+                loop.call_soon_threadsafe(results_queue.put_nowait, (item, result))
+        except Exception as e:
+            logger.error(f"Batch conversion error: {e}")
+        finally:
+            loop.call_soon_threadsafe(results_queue.put_nowait, None)
+
+    async def consume_results():
+        while True:
+            entry = await results_queue.get()
+            if entry is None:
+                break
+            (index, source, stem), result = entry
+            try:
+                if result.status == ConversionStatus.SUCCESS:
+                    doc = result.document
+                    output_file = get_unique_filename(stem, output_dir)
+                    await asyncio.to_thread(
+                        export_markdown_to_file, doc, output_file, image_mode
+                    )
+                    logger.info(f"✓ Converted: {output_file.name} ({len(doc.pages)} pages)")
+                    final_results[index] = output_file
+                else:
+                    logger.error(f"✗ Failed: {source} - {result.status}")
+            except Exception as e:
+                logger.error(f"✗ Error processing {source}: {e}")
+            finally:
+                # Free the feeder's slot once this document is written
+                pending_slots.release()
+
+    if other_items:
+        feeder = loop.run_in_executor(get_converter_pool(), feed_results)
+        await consume_results()
+        await feeder
+
     elapsed = time.time() - start
-    successful = len([r for r in final_results if r is not None])
+    successful = sum(1 for r in final_results if r is not None)
     logger.info(f"Async batch complete: {successful}/{len(input_sources)} files in {elapsed:.2f}s")
-    
+
+    # Close here while the loop that owns the session is still running
+    await close_http_session()
+
     return final_results
 
 # ==================== CLI ====================
@@ -731,6 +995,16 @@ Examples:
     parser.add_argument("--no-ocr", action="store_true", help="Disable OCR")
     parser.add_argument("--ocr-lang", nargs="+", default=["en"],
                        help="OCR languages (default: en)")
+
+    # Image settings
+    parser.add_argument("--embed-images", action="store_true",
+                       help="Base64-embed images in the markdown (default: referenced sibling files)")
+    parser.add_argument("--embed-page-images", action="store_true",
+                       help="Rasterize and embed full-page images (expensive)")
+    parser.add_argument("--no-picture-images", action="store_true",
+                       help="Skip rasterizing figures")
+    parser.add_argument("--no-images", action="store_true",
+                       help="Markdown-only output: no rasterization, image placeholders")
     
     # Threaded pipeline settings
     parser.add_argument("--queue-size", type=int, default=20,
@@ -776,8 +1050,16 @@ Examples:
         'ocr_batch': args.ocr_batch,
         'layout_batch': args.layout_batch,
         'table_batch': args.table_batch,
-        'ocr_lang': args.ocr_lang
+        'ocr_lang': args.ocr_lang,
+        'generate_page_images': args.embed_page_images and not args.no_images,
+        'generate_picture_images': not (args.no_picture_images or args.no_images)
     }
+    if args.no_images:
+        image_mode = "placeholder"
+    elif args.embed_images:
+        image_mode = "embedded"
+    else:
+        image_mode = "referenced"
     
     try:
         # Async mode
@@ -786,7 +1068,8 @@ Examples:
                 args.input,
                 output_dir,
                 converter_config,
-                max_concurrent=args.max_concurrent
+                max_concurrent=args.max_concurrent,
+                image_mode=image_mode
             ))
         # Batch mode (sync)
         elif args.batch or len(args.input) > 1:
@@ -794,15 +1077,17 @@ Examples:
                 args.input,
                 output_dir,
                 converter_config,
-                raises_on_error=args.strict
+                raises_on_error=args.strict,
+                image_mode=image_mode
             )
         # Single file mode (sync)
         else:
-            result = convert_single_sync(args.input[0], output_dir, converter_config)
+            result = convert_single_sync(args.input[0], output_dir, converter_config,
+                                         image_mode=image_mode)
             results = [result]
         
         # Report results
-        successful = len([r for r in results if r is not None])
+        successful = sum(1 for r in results if r is not None)
         if successful == len(args.input):
             logger.info(f"✓ All {successful} files converted successfully")
             sys.exit(0)
@@ -817,7 +1102,8 @@ Examples:
         logger.error(f"✗ Fatal error: {e}", exc_info=True)
         sys.exit(2)
     finally:
-        # Cleanup logging listener
+        # Cleanup shared executor and logging listener
+        shutdown_converter_pool()
         if _logging_listener:
             _logging_listener.stop()
 